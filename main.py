@@ -1,39 +1,801 @@
+import time
+STARTUP_T0 = time.perf_counter()
+
 import sys
 import os
 import re
 import json
 import fnmatch
+import difflib
+import hashlib
+from collections import OrderedDict
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QTextEdit, QFileDialog, 
                              QTreeWidget, QTreeWidgetItem, QMessageBox, QLabel, 
                              QSplitter, QTreeWidgetItemIterator, QComboBox, 
                              QInputDialog, QFileIconProvider, QStyleFactory, 
-                             QStyle, QCheckBox)
-from PyQt6.QtCore import Qt, QFileInfo, QSize, QTimer
-from PyQt6.QtGui import QIcon, QAction
+                             QStyle, QCheckBox, QDialog, QDialogButtonBox,
+                             QPlainTextEdit, QStackedWidget)
+from PyQt6.QtCore import Qt, QFileInfo, QTimer, QThread, pyqtSignal, QFileSystemWatcher
+from PyQt6.QtGui import QFontDatabase
 
 CONFIG_FILE = "projects.json"
+PROJECTS_DIR = "projects.d"
+WARM_PROJECT_LIMIT = 4
+WARM_MEMORY_BUDGET = 256 * 1024 * 1024
+TREE_ITEM_BYTES = 600  # rough cost of one QTreeWidgetItem with text, icon, flags and path
+
+class AppliedChanges:
+    """Absolute paths touched while applying a response."""
+
+    def __init__(self):
+        self.created = set()
+        self.modified = set()
+        self.deleted = set()
+
+    def structural_paths(self):
+        return self.created | self.deleted
+
+class EditOperation:
+    """A single parsed instruction from a model response."""
+
+    def __init__(self, kind, path, search=None, replace=None, content=None, line=None):
+        self.kind = kind  # "modify", "create" or "delete"
+        self.path = path
+        self.search = search
+        self.replace = replace
+        self.content = content
+        self.line = line
+
+
+class ResponseParser:
+    """Line-oriented state machine for the edit protocol.
+
+    Feed the response in chunks of any size and call close() to get the parsed
+    EditOperations plus a message for every malformed block, tagged with its line number.
+    A header at the start of a line always begins a new block; if a code block is still
+    open at that point it is reported as unterminated and its partial operation dropped.
+    """
+
+    HEADERS = (("Updated path:", "modify"), ("Replace file:", "create"), ("New:", "create"), ("Delete:", "delete"))
+    FENCE_OPEN = re.compile(r'^\s*```[\w+#.-]*\s*$')
+
+    IDLE = "idle"
+    EXPECT_REPLACE = "expect_replace"
+    EXPECT_WITH = "expect_with"
+    EXPECT_CONTENT = "expect_content"
+    EXPECT_FENCE = "expect_fence"
+    IN_FENCE = "in_fence"
+    DONE = "done"
 
-class ClaudeInterfaceApp(QMainWindow):
     def __init__(self):
+        self.operations = []
+        self.messages = []
+        self.partial = []  # pieces of the current, not yet terminated line
+        self.line_no = 0
+        self.state = self.IDLE
+        self.kind = None
+        self.path = None
+        self.header_line = 0
+        self.block_count = 0
+        self.target = None  # "search", "replace" or "content" while reading a code block
+        self.target_line = 0
+        self.block_lines = []
+        self.search = None
+
+    def feed(self, chunk):
+        lines = chunk.split("\n")
+        if len(lines) == 1:
+            self.partial.append(chunk)
+            return
+        lines[0] = "".join(self.partial) + lines[0]
+        self.partial = [lines.pop()]
+        for line in lines:
+            self.line_no += 1
+            self.process_line(line)
+
+    def close(self):
+        remainder = "".join(self.partial)
+        self.partial = []
+        if remainder:
+            self.line_no += 1
+            self.process_line(remainder)
+        self.finish_block()
+        return self.operations, self.messages
+
+    def report(self, line_no, msg):
+        self.messages.append(f"Line {line_no}: {msg}")
+
+    def match_header(self, line):
+        for prefix, kind in self.HEADERS:
+            if line.startswith(prefix):
+                return kind, line[len(prefix):].strip().strip('`\'"')
+        return None
+
+    def process_line(self, line):
+        header = self.match_header(line)
+        if header:
+            self.finish_block()
+            self.start_block(*header)
+            return
+
+        if self.state == self.IN_FENCE:
+            stripped = line.rstrip()
+            if stripped.endswith("```"):
+                # A fence may close on the last code line, as in "    return 1```"
+                code = stripped[:-3]
+                if code.strip():
+                    self.block_lines.append(code)
+                self.close_fence()
+            else:
+                self.block_lines.append(line + "\n")
+            return
+
+        label = line.rstrip()
+        if self.state == self.EXPECT_FENCE:
+            if self.FENCE_OPEN.match(line):
+                self.state = self.IN_FENCE
+                self.target_line = self.line_no
+                self.block_lines = []
+            elif label and self.target != "content":
+                self.report(self.line_no, f"Expected a code block after {self.target_label()} for: {self.path}")
+                self.search = None
+                self.state = self.EXPECT_REPLACE
+        elif self.state == self.EXPECT_REPLACE:
+            if label.endswith("Replace:"):
+                self.expect_fence("search")
+            elif label.endswith("With:"):
+                self.report(self.line_no, f"With: without a preceding Replace: for: {self.path}")
+        elif self.state == self.EXPECT_WITH:
+            if label.endswith("With:"):
+                self.expect_fence("replace")
+            elif label.endswith("Replace:"):
+                self.report(self.line_no, f"Replace: block without a With: block for: {self.path}")
+                self.expect_fence("search")
+        elif self.state == self.EXPECT_CONTENT:
+            if label.endswith("Content:"):
+                self.expect_fence("content")
+
+    def target_label(self):
+        return {"search": "Replace:", "replace": "With:", "content": "Content:"}[self.target]
+
+    def expect_fence(self, target):
+        self.target = target
+        self.state = self.EXPECT_FENCE
+
+    def close_fence(self):
+        text = "".join(self.block_lines)
+        self.block_lines = []
+        if self.target == "search":
+            self.search = text
+            self.state = self.EXPECT_WITH
+        elif self.target == "replace":
+            self.operations.append(EditOperation("modify", self.path, search=self.search, replace=text,
+                                                 line=self.header_line))
+            self.block_count += 1
+            self.search = None
+            self.state = self.EXPECT_REPLACE
+        else:
+            self.operations.append(EditOperation("create", self.path, content=text, line=self.header_line))
+            self.state = self.DONE
+
+    def start_block(self, kind, path):
+        self.kind = kind
+        self.path = path
+        self.header_line = self.line_no
+        self.block_count = 0
+        self.search = None
+        if not path:
+            self.report(self.line_no, "Missing path in header")
+            self.state = self.IDLE
+        elif kind == "delete":
+            self.operations.append(EditOperation("delete", path, line=self.line_no))
+            self.state = self.IDLE
+        elif kind == "modify":
+            self.state = self.EXPECT_REPLACE
+        else:
+            self.state = self.EXPECT_CONTENT
+
+    def finish_block(self):
+        if self.state == self.IN_FENCE:
+            self.report(self.target_line, f"Unterminated code block after {self.target_label()} for: {self.path}")
+        elif self.state == self.EXPECT_FENCE:
+            self.report(self.header_line, f"Missing code block after {self.target_label()} for: {self.path}")
+        elif self.state == self.EXPECT_WITH:
+            self.report(self.header_line, f"Replace: block without a With: block for: {self.path}")
+        elif self.state == self.EXPECT_REPLACE and self.block_count == 0:
+            self.report(self.header_line, f"No Replace/With blocks found for: {self.path}")
+        elif self.state == self.EXPECT_CONTENT:
+            self.report(self.header_line, f"No content found for new file: {self.path}")
+        self.state = self.IDLE
+
+
+def parse_response(response):
+    parser = ResponseParser()
+    parser.feed(response)
+    return parser.close()
+
+
+def parse_stream(stream, chunk_size=1 << 16):
+    """Parse a response from a text stream without holding it in memory as one string."""
+    parser = ResponseParser()
+    for chunk in iter(lambda: stream.read(chunk_size), ""):
+        parser.feed(chunk)
+    return parser.close()
+
+
+def print_parse_report(source):
+    """Parse a response file (or stdin for "-") and print what would be applied. Returns an exit code."""
+    try:
+        if source == "-":
+            operations, messages = parse_stream(sys.stdin)
+        else:
+            with open(source, 'r', encoding='utf-8') as f:
+                operations, messages = parse_stream(f)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading {source}: {e}", file=sys.stderr)
+        return 2
+    for op in operations:
+        print(f"Line {op.line}: {op.kind} {op.path}")
+    for msg in messages:
+        print(msg, file=sys.stderr)
+    return 1 if messages else 0
+
+
+def replace_block(content, search_txt, replace_txt):
+    if search_txt in content:
+        return content.replace(search_txt, replace_txt)
+
+    norm_content = content.replace('\r\n', '\n')
+    norm_search = search_txt.replace('\r\n', '\n')
+    norm_search_stripped = norm_search.strip()
+    
+    if norm_search in norm_content:
+        return norm_content.replace(norm_search, replace_txt)
+    
+    if norm_search_stripped in norm_content:
+        return norm_content.replace(norm_search_stripped, replace_txt)
+
+    return None
+
+
+class FilePlan:
+    """The old and new content of one file after simulating its operations, split into selectable hunks."""
+
+    CONTEXT_LINES = 3
+
+    def __init__(self, abs_path, display_path):
+        self.abs_path = abs_path
+        self.display_path = display_path
+        self.old_text = None
+        self.new_text = None
+        self.log = []
+        self.hunks = []
+        self.selected = []
+        self.opcode_hunks = {}
+        self.opcodes = []
+        self.old_lines = []
+        self.new_lines = []
+
+    def simulate(self, operations):
+        try:
+            if os.path.exists(self.abs_path):
+                with open(self.abs_path, 'r', encoding='utf-8') as f:
+                    self.old_text = f.read()
+        except Exception as e:
+            self.log.append(f"Failed to read {self.display_path}: {e}")
+            return
+
+        text = self.old_text
+        for op in operations:
+            if op.kind == "modify":
+                new_text = replace_block(text, op.search, op.replace) if text is not None else None
+                if new_text is None:
+                    self.log.append(f"Failed to modify: {op.path}")
+                else:
+                    text = new_text
+            elif op.kind == "create":
+                text = op.content
+            elif op.kind == "delete":
+                if text is None:
+                    self.log.append(f"Failed to delete: {op.path}")
+                text = None
+        self.new_text = text
+
+    def compute_hunks(self):
+        if self.old_text == self.new_text:
+            return
+        self.old_lines = (self.old_text or "").splitlines(keepends=True)
+        self.new_lines = (self.new_text or "").splitlines(keepends=True)
+        matcher = difflib.SequenceMatcher(None, self.old_lines, self.new_lines, autojunk=False)
+        # get_grouped_opcodes trims the matcher's cached opcode list in place, so keep a copy
+        self.opcodes = list(matcher.get_opcodes())
+        for index, group in enumerate(matcher.get_grouped_opcodes(self.CONTEXT_LINES)):
+            self.hunks.append(group)
+            for tag, i1, i2, j1, j2 in group:
+                if tag != 'equal':
+                    self.opcode_hunks[(i1, j1)] = index
+        self.selected = [True] * len(self.hunks)
+
+    def kind(self):
+        if self.old_text is None:
+            return "Create"
+        if self.new_text is None:
+            return "Delete"
+        return "Modify"
+
+    def hunk_header(self, index):
+        group = self.hunks[index]
+        i1, i2 = group[0][1], group[-1][2]
+        j1, j2 = group[0][3], group[-1][4]
+        return f"@@ -{i1 + 1},{i2 - i1} +{j1 + 1},{j2 - j1} @@"
+
+    def hunk_diff(self, index):
+        old_lines = self.old_lines
+        new_lines = self.new_lines
+        out = [self.hunk_header(index) + "\n"]
+        for tag, i1, i2, j1, j2 in self.hunks[index]:
+            if tag == 'equal':
+                out.extend(" " + line for line in old_lines[i1:i2])
+                continue
+            out.extend("-" + line for line in old_lines[i1:i2])
+            out.extend("+" + line for line in new_lines[j1:j2])
+        return "".join(line if line.endswith("\n") else line + "\n" for line in out)
+
+    def file_diff(self):
+        header = f"--- {self.display_path}\n+++ {self.display_path}\n"
+        return header + "".join(self.hunk_diff(i) for i in range(len(self.hunks)))
+
+    def build_content(self):
+        """Return the content to write given the selected hunks, or None if the file should not exist."""
+        if self.new_text is None:
+            return None if all(self.selected) else self.old_text
+        if self.old_text is None:
+            return self.new_text if all(self.selected) else None
+
+        old_lines = self.old_lines
+        new_lines = self.new_lines
+        out = []
+        for tag, i1, i2, j1, j2 in self.opcodes:
+            if tag != 'equal' and self.selected[self.opcode_hunks[(i1, j1)]]:
+                out.extend(new_lines[j1:j2])
+            else:
+                out.extend(old_lines[i1:i2])
+        return "".join(out)
+
+
+def build_file_plan(abs_path, display_path, operations):
+    plan = FilePlan(abs_path, display_path)
+    plan.simulate(operations)
+    plan.compute_hunks()
+    return plan
+
+
+class DiffWorker(QThread):
+    plan_ready = pyqtSignal(object)
+
+    def __init__(self, file_operations, parent=None):
+        super().__init__(parent)
+        self.file_operations = file_operations
+
+    def run(self):
+        for abs_path, display_path, operations in self.file_operations:
+            if self.isInterruptionRequested():
+                return
+            self.plan_ready.emit(build_file_plan(abs_path, display_path, operations))
+
+
+class DiffPreviewDialog(QDialog):
+    """Shows per-file diffs as they are computed and lets the user pick which hunks to apply."""
+
+    def __init__(self, file_operations, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Review Changes")
+        self.resize(1100, 700)
+        self.plans = []
+        self.total = len(file_operations)
+
+        layout = QVBoxLayout(self)
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        layout.addWidget(splitter)
+
+        self.hunk_tree = QTreeWidget()
+        self.hunk_tree.setHeaderLabel("Changes")
+        self.hunk_tree.currentItemChanged.connect(self.show_item_diff)
+        splitter.addWidget(self.hunk_tree)
+
+        self.diff_view = QPlainTextEdit()
+        self.diff_view.setReadOnly(True)
+        self.diff_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.diff_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        splitter.addWidget(self.diff_view)
+        splitter.setStretchFactor(0, 1)
+        splitter.setStretchFactor(1, 3)
+
+        self.progress_label = QLabel()
+        layout.addWidget(self.progress_label)
+
+        self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Apply | QDialogButtonBox.StandardButton.Cancel)
+        self.buttons.button(QDialogButtonBox.StandardButton.Apply).setText("Apply Selected")
+        self.buttons.button(QDialogButtonBox.StandardButton.Apply).setEnabled(False)
+        self.buttons.button(QDialogButtonBox.StandardButton.Apply).clicked.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+
+        self.update_progress()
+        self.worker = DiffWorker(file_operations, self)
+        self.worker.plan_ready.connect(self.add_plan)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.start()
+
+    def update_progress(self):
+        self.progress_label.setText(f"Computed {len(self.plans)} of {self.total} file(s)")
+
+    def add_plan(self, plan):
+        self.plans.append(plan)
+        self.update_progress()
+
+        file_item = QTreeWidgetItem(self.hunk_tree)
+        file_item.setText(0, f"{plan.kind()}: {plan.display_path}")
+        file_item.setData(0, Qt.ItemDataRole.UserRole, (plan, None))
+        if not plan.hunks:
+            file_item.setText(0, f"No changes: {plan.display_path}")
+            return
+
+        file_item.setFlags(file_item.flags() | Qt.ItemFlag.ItemIsAutoTristate | Qt.ItemFlag.ItemIsUserCheckable)
+        for index in range(len(plan.hunks)):
+            hunk_item = QTreeWidgetItem(file_item)
+            hunk_item.setText(0, plan.hunk_header(index))
+            hunk_item.setFlags(hunk_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            hunk_item.setCheckState(0, Qt.CheckState.Checked)
+            hunk_item.setData(0, Qt.ItemDataRole.UserRole, (plan, index))
+
+        if self.hunk_tree.currentItem() is None:
+            self.hunk_tree.setCurrentItem(file_item)
+
+    def show_item_diff(self, current, previous=None):
+        if current is None:
+            self.diff_view.clear()
+            return
+        plan, index = current.data(0, Qt.ItemDataRole.UserRole)
+        lines = list(plan.log)
+        lines.append(plan.file_diff() if index is None else plan.hunk_diff(index))
+        self.diff_view.setPlainText("\n".join(lines))
+
+    def on_worker_finished(self):
+        self.update_progress()
+        self.buttons.button(QDialogButtonBox.StandardButton.Apply).setEnabled(True)
+
+    def selected_plans(self):
+        for i in range(self.hunk_tree.topLevelItemCount()):
+            file_item = self.hunk_tree.topLevelItem(i)
+            for j in range(file_item.childCount()):
+                hunk_item = file_item.child(j)
+                plan, index = hunk_item.data(0, Qt.ItemDataRole.UserRole)
+                plan.selected[index] = hunk_item.checkState(0) == Qt.CheckState.Checked
+        return self.plans
+
+    def done(self, result):
+        self.worker.requestInterruption()
+        self.worker.wait()
+        super().done(result)
+
+
+def encode_path_set(paths, roots):
+    """Encode absolute paths as one prefix tree per root, relative to the deepest root containing them.
+
+    Directories map to nested dicts, member files to 1, and a directory that is itself
+    a member carries an empty-string key.
+    """
+    roots = sorted(roots, key=len, reverse=True)
+    encoded = {}
+    for path in sorted(paths):
+        for root in roots:
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                break
+        else:
+            continue
+
+        node = encoded.setdefault(root, {})
+        rel = os.path.relpath(path, root)
+        if rel == '.':
+            node[""] = 1
+            continue
+        parts = rel.split(os.sep)
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {"": 1} if child == 1 else {}
+            node = child
+        leaf = parts[-1]
+        if isinstance(node.get(leaf), dict):
+            node[leaf][""] = 1
+        else:
+            node[leaf] = 1
+    return encoded
+
+
+def decode_path_set(encoded):
+    paths = set()
+    stack = [(root, node) for root, node in encoded.items()]
+    while stack:
+        path, node = stack.pop()
+        if node == 1:
+            paths.add(path)
+            continue
+        for name, child in node.items():
+            if name == "":
+                paths.add(path)
+            else:
+                stack.append((os.path.join(path, name), child))
+    return paths
+
+
+class PathTree:
+    """Set-like membership over an encoded path set.
+
+    Nodes are resolved one directory at a time as lookups arrive, so loading a project
+    does not rebuild every absolute path up front; during a tree scan each directory
+    is walked once and every entry in it is a dict lookup.
+    """
+
+    def __init__(self, encoded):
+        self.encoded = encoded
+        self.dir_nodes = {}
+
+    def __bool__(self):
+        return bool(self.encoded)
+
+    def __iter__(self):
+        return iter(decode_path_set(self.encoded))
+
+    def node(self, path):
+        node = self.encoded.get(path)
+        if node is not None:
+            return node
+        parent, _, name = path.rpartition(os.sep)
+        if not name:
+            return None
+        parent_node = self.dir_nodes.get(parent, 0)
+        if parent_node == 0:
+            parent_node = self.dir_nodes[parent] = self.node(parent) if parent else None
+        return parent_node.get(name) if isinstance(parent_node, dict) else None
+
+    def __contains__(self, path):
+        node = self.node(path)
+        return node == 1 or (isinstance(node, dict) and "" in node)
+
+
+def new_project_state():
+    return {"roots": [], "context": "", "checked": set(), "expanded": set()}
+
+
+class ProjectStore:
+    """A small project index plus one state file per project, loaded only when the project is opened."""
+
+    def __init__(self, index_path=CONFIG_FILE, projects_dir=PROJECTS_DIR):
+        self.index_path = index_path
+        self.projects_dir = projects_dir
+        self.files = {}
+        self.cache = {}
+
+    def __contains__(self, name):
+        return name in self.files
+
+    def __len__(self):
+        return len(self.files)
+
+    def names(self):
+        return list(self.files.keys())
+
+    def load(self):
+        """Read the index and return the stored current project name."""
+        if not os.path.exists(self.index_path):
+            return None
+        with open(self.index_path, 'r') as f:
+            data = json.load(f)
+
+        projects = data.get('projects', {})
+        legacy = {name: value for name, value in projects.items() if isinstance(value, dict)}
+        for name, value in projects.items():
+            if name not in legacy:
+                self.files[name] = value
+
+        for name, value in legacy.items():
+            self.put(name, {
+                "roots": value.get("roots", []),
+                "context": value.get("context", ""),
+                "checked": set(value.get("checked", [])),
+                "expanded": set(value.get("expanded", []))
+            })
+        if legacy:
+            self.save_index(data.get('current_project'))
+        return data.get('current_project')
+
+    def save_index(self, current_project):
+        data = {
+            "version": 2,
+            "current_project": current_project,
+            "projects": self.files
+        }
+        with open(self.index_path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def state_path(self, name):
+        return os.path.join(self.projects_dir, self.files[name])
+
+    def get(self, name):
+        if name in self.cache:
+            return self.cache[name]
+        state = new_project_state()
+        if name in self.files and os.path.exists(self.state_path(name)):
+            try:
+                with open(self.state_path(name), 'r') as f:
+                    data = json.load(f)
+                state["roots"] = data.get("roots", [])
+                state["context"] = data.get("context", "")
+                state["checked"] = PathTree(data.get("checked", {}))
+                state["expanded"] = PathTree(data.get("expanded", {}))
+            except Exception as e:
+                print(f"Error loading project {name}: {e}")
+        self.cache[name] = state
+        return state
+
+    def file_name(self, name):
+        slug = re.sub(r'[^A-Za-z0-9_-]+', '_', name)[:40]
+        digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+        return f"{slug}-{digest}.json"
+
+    def create(self, name):
+        self.files[name] = self.file_name(name)
+        self.cache[name] = new_project_state()
+
+    def put(self, name, state):
+        self.files.setdefault(name, self.file_name(name))
+        self.cache[name] = state
+
+        data = {
+            "roots": state["roots"],
+            "context": state["context"],
+            "checked": encode_path_set(state["checked"], state["roots"]),
+            "expanded": encode_path_set(state["expanded"], state["roots"])
+        }
+        os.makedirs(self.projects_dir, exist_ok=True)
+        with open(self.state_path(name), 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    def delete(self, name):
+        path = self.state_path(name)
+        del self.files[name]
+        self.cache.pop(name, None)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def common_prefix_length(a, b):
+    """Length of the shared prefix of two byte strings, compared a block at a time."""
+    limit = min(len(a), len(b))
+    block = 4096
+    i = 0
+    while i + block <= limit and a[i:i + block] == b[i:i + block]:
+        i += block
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class ScanEntry:
+    __slots__ = ("name", "path", "real_path", "is_dir")
+
+    def __init__(self, name, path, real_path, is_dir):
+        self.name = name
+        self.path = path
+        self.real_path = real_path
+        self.is_dir = is_dir
+
+
+class ScanCache:
+    """Directory listings shared by all roots, keyed by real path so nested or overlapping roots scan each directory once."""
+
+    def __init__(self):
+        self.listings = {}
+
+    def listdir(self, real_path):
+        """Return sorted (name, is_dir, is_symlink) tuples for an already resolved path, scanning it only on a cache miss."""
+        listing = self.listings.get(real_path)
+        if listing is None:
+            try:
+                listing = [(e.name, e.is_dir(), e.is_symlink()) for e in os.scandir(real_path)]
+            except (PermissionError, FileNotFoundError, NotADirectoryError):
+                listing = []
+            listing.sort(key=lambda e: (not e[1], e[0].lower()))
+            self.listings[real_path] = listing
+        return listing
+
+    def invalidate(self, real_path, recursive=False):
+        self.listings.pop(real_path, None)
+        if recursive:
+            prefix = real_path.rstrip(os.sep) + os.sep
+            for key in [k for k in self.listings if k.startswith(prefix)]:
+                del self.listings[key]
+
+    def clear(self):
+        self.listings.clear()
+
+
+class ProjectView:
+    """The trees and directory watcher of one open project, kept alive while the project is warm."""
+
+    def __init__(self, name, parent):
+        self.name = name
+        self.splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.trees = []
+        self.watcher = QFileSystemWatcher(parent)
+        self.unwatched = set()  # directories the watcher refused, polled by the refresh timer instead
+        self.changed_dirs = set()
+        self.estimated_bytes = 0
+
+    def estimate_bytes(self):
+        count = 0
+        for tree in self.trees:
+            iterator = QTreeWidgetItemIterator(tree)
+            while iterator.value():
+                count += 1
+                iterator += 1
+        self.estimated_bytes = count * TREE_ITEM_BYTES
+        return self.estimated_bytes
+
+
+class StartupTimer:
+    """Prints time since process start for each startup stage when measurement mode is on."""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+
+    def mark(self, stage):
+        if self.enabled:
+            elapsed = (time.perf_counter() - STARTUP_T0) * 1000
+            print(f"[startup] {stage}: {elapsed:.1f} ms", file=sys.stderr)
+
+    def finish(self, stage):
+        self.mark(stage)
+        if self.enabled:
+            QTimer.singleShot(0, QApplication.quit)
+
+
+class ClaudeInterfaceApp(QMainWindow):
+    def __init__(self, startup_timer=None):
         super().__init__()
         self.setWindowTitle("Claude Linux Interface")
         self.resize(1200, 850)
         
-        self.projects_data = {}
+        self.project_store = ProjectStore()
         self.current_project_name = "Default"
         self.is_dark_mode = False
-        self.icon_provider = QFileIconProvider()
+        self.icon_provider = None
+        self.startup_timer = startup_timer or StartupTimer(False)
+        self.first_paint_done = False
+        self.ui_ready = False
+        self.startup_complete = False
+        self.pending_roots = []
+        self.pending_checked = set()
+        self.pending_expanded = set()
         self.file_trees = []
+        self.warm_views = OrderedDict()  # project name -> ProjectView, least recently used first
+        self.active_view = None
+        self.scan_cache = ScanCache()
+        self.last_copied_payload = None
         self.is_dirty = False
         
         self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.refresh_file_trees)
-        self.refresh_timer.start(10000)
+        self.refresh_timer.timeout.connect(self.poll_unwatched_dirs)
 
         self.autosave_timer = QTimer(self)
         self.autosave_timer.timeout.connect(self.auto_save)
-        self.autosave_timer.start(3000)
+
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setSingleShot(True)
+        self.watch_timer.timeout.connect(self.sync_watched_changes)
 
         self.system_prompt = (
             "I prefer concise, short responses.\n"
@@ -70,7 +832,46 @@ class ClaudeInterfaceApp(QMainWindow):
 
         self.setup_ui()
         self.load_projects()
+        self.startup_timer.mark("window constructed")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            self.startup_timer.mark("first paint")
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """Work deferred until the window has been painted once."""
         self.apply_theme()
+        self.refresh_timer.start(10000)
+        self.autosave_timer.start(3000)
+        self.ui_ready = True
+        self.restore_pending_roots_step()
+
+    def restore_next_root(self):
+        root_path = self.pending_roots.pop(0)
+        if os.path.exists(root_path):
+            self.add_directory_column(root_path, self.pending_checked, self.pending_expanded)
+
+    def restore_pending_roots_step(self):
+        """Restore one root per event loop turn so the window stays responsive, leftmost root first."""
+        if self.pending_roots:
+            self.restore_next_root()
+        if self.pending_roots:
+            QTimer.singleShot(0, self.restore_pending_roots_step)
+        elif not self.startup_complete:
+            self.startup_complete = True
+            self.startup_timer.finish("roots restored")
+
+    def ensure_roots_loaded(self):
+        while self.pending_roots:
+            self.restore_next_root()
+
+    def file_icon(self, path):
+        if self.icon_provider is None:
+            self.icon_provider = QFileIconProvider()
+        return self.icon_provider.icon(QFileInfo(path))
 
     def setup_ui(self):
         central_widget = QWidget()
@@ -123,8 +924,9 @@ class ClaudeInterfaceApp(QMainWindow):
         file_btn_layout.addStretch()
         files_layout.addLayout(file_btn_layout)
 
-        self.file_splitter = QSplitter(Qt.Orientation.Horizontal)
-        files_layout.addWidget(self.file_splitter)
+        self.file_splitter = None
+        self.project_stack = QStackedWidget()
+        files_layout.addWidget(self.project_stack)
         
         splitter.addWidget(files_widget)
 
@@ -140,6 +942,15 @@ class ClaudeInterfaceApp(QMainWindow):
         options_layout = QHBoxLayout()
         self.chk_include_sys = QCheckBox("Include System Prompt in Copy")
         options_layout.addWidget(self.chk_include_sys)
+        self.chk_auto_check_new = QCheckBox("Auto-check New Files")
+        options_layout.addWidget(self.chk_auto_check_new)
+        self.chk_review_changes = QCheckBox("Review Changes Before Applying")
+        self.chk_review_changes.setChecked(True)
+        options_layout.addWidget(self.chk_review_changes)
+        self.chk_cache_order = QCheckBox("Cache-Friendly Ordering")
+        self.chk_cache_order.setToolTip("Put the system prompt and least recently changed files first "
+                                        "so consecutive copies share a long common prefix.")
+        options_layout.addWidget(self.chk_cache_order)
         options_layout.addStretch()
         context_layout.addLayout(options_layout)
 
@@ -159,6 +970,10 @@ class ClaudeInterfaceApp(QMainWindow):
         self.btn_paste_apply.clicked.connect(self.paste_and_apply)
         action_layout.addWidget(self.btn_paste_apply)
 
+        self.btn_apply_file = QPushButton("Apply Response from File")
+        self.btn_apply_file.clicked.connect(self.apply_response_file)
+        action_layout.addWidget(self.btn_apply_file)
+
         context_layout.addLayout(action_layout)
         
         # New row of buttons
@@ -220,64 +1035,61 @@ class ClaudeInterfaceApp(QMainWindow):
             self.save_current_project_state()
 
     def load_projects(self):
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.projects_data = data.get('projects', {})
-                    self.current_project_name = data.get('current_project', 'Default')
-            except Exception as e:
-                print(f"Error loading projects: {e}")
+        try:
+            self.current_project_name = self.project_store.load() or 'Default'
+        except Exception as e:
+            print(f"Error loading projects: {e}")
         
-        if not self.projects_data:
-            self.projects_data = {"Default": {"roots": [], "context": "", "checked": [], "expanded": []}}
+        if not len(self.project_store):
+            self.project_store.create("Default")
             self.current_project_name = "Default"
+        elif self.current_project_name not in self.project_store:
+            self.current_project_name = self.project_store.names()[0]
 
         self.update_project_combo()
         self.load_project_state(self.current_project_name)
 
     def save_projects_to_disk(self):
-        data = {
-            "current_project": self.current_project_name,
-            "projects": self.projects_data
-        }
         try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+            self.project_store.save_index(self.current_project_name)
         except Exception as e:
             self.status_message(f"Error saving config: {e}")
 
     def update_project_combo(self):
         self.project_combo.blockSignals(True)
         self.project_combo.clear()
-        self.project_combo.addItems(sorted(self.projects_data.keys()))
+        self.project_combo.addItems(sorted(self.project_store.names()))
         self.project_combo.setCurrentText(self.current_project_name)
         self.project_combo.blockSignals(False)
 
     def new_project(self):
         name, ok = QInputDialog.getText(self, "New Project", "Project Name:")
         if ok and name:
-            if name in self.projects_data:
+            if name in self.project_store:
                 QMessageBox.warning(self, "Error", "Project already exists.")
                 return
             
             self.save_current_project_state()
-            self.projects_data[name] = {"roots": [], "context": "", "checked": [], "expanded": []}
+            self.project_store.create(name)
             self.current_project_name = name
             self.update_project_combo()
             self.load_project_state(name)
             self.save_projects_to_disk()
 
     def delete_project(self):
-        if len(self.projects_data) <= 1:
+        if len(self.project_store) <= 1:
             QMessageBox.warning(self, "Error", "Cannot delete the last project.")
             return
             
         confirm = QMessageBox.question(self, "Confirm", f"Delete project '{self.current_project_name}'?", 
                                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if confirm == QMessageBox.StandardButton.Yes:
-            del self.projects_data[self.current_project_name]
-            self.current_project_name = list(self.projects_data.keys())[0]
+            try:
+                self.project_store.delete(self.current_project_name)
+            except Exception as e:
+                self.status_message(f"Error deleting project: {e}")
+            self.discard_view(self.current_project_name)
+            self.current_project_name = self.project_store.names()[0]
             self.update_project_combo()
             self.load_project_state(self.current_project_name)
             self.save_projects_to_disk()
@@ -293,9 +1105,10 @@ class ClaudeInterfaceApp(QMainWindow):
         self.save_projects_to_disk()
 
     def save_current_project_state(self):
+        self.ensure_roots_loaded()
         roots = []
-        checked = []
-        expanded = []
+        checked = set()
+        expanded = set()
         
         for tree in self.file_trees:
             if tree.topLevelItemCount() > 0:
@@ -309,61 +1122,150 @@ class ClaudeInterfaceApp(QMainWindow):
                 path = item.data(0, Qt.ItemDataRole.UserRole)
                 
                 if path and item.checkState(0) == Qt.CheckState.Checked and os.path.isfile(path):
-                    checked.append(path)
+                    checked.add(path)
                 
                 if path and item.isExpanded():
-                    expanded.append(path)
+                    expanded.add(path)
                     
                 iterator += 1
             
-        self.projects_data[self.current_project_name] = {
-            "roots": roots,
-            "context": self.text_context.toPlainText(),
-            "checked": checked,
-            "expanded": expanded
-        }
+        try:
+            self.project_store.put(self.current_project_name, {
+                "roots": roots,
+                "context": self.text_context.toPlainText(),
+                "checked": checked,
+                "expanded": expanded
+            })
+        except Exception as e:
+            self.status_message(f"Error saving project: {e}")
+            return
         self.save_projects_to_disk()
         self.is_dirty = False
         self.status_message("Project saved.")
 
     def load_project_state(self, name):
-        data = self.projects_data.get(name, {})
-        
-        for tree in self.file_trees:
-            tree.deleteLater()
-        self.file_trees = []
+        data = self.project_store.get(name)
         
         self.text_context.blockSignals(True)
         self.text_context.setPlainText(data.get("context", ""))
         self.text_context.blockSignals(False)
-        
-        roots = data.get("roots", [])
-        checked_set = set(data.get("checked", []))
-        expanded_set = set(data.get("expanded", []))
-        
-        for root_path in roots:
-            if os.path.exists(root_path):
-                self.add_directory_column(root_path, checked_set, expanded_set)
-                
+
+        view = self.warm_views.pop(name, None)
+        if view is None:
+            view = self.create_project_view(name)
+            self.scan_cache.clear()
+            self.pending_roots = list(data["roots"])
+            self.pending_checked = data["checked"]
+            self.pending_expanded = data["expanded"]
+            if self.ui_ready:
+                QTimer.singleShot(0, self.restore_pending_roots_step)
+        else:
+            self.pending_roots = []
+
+        self.warm_views[name] = view
+        self.activate_view(view)
+        self.evict_cold_views()
         self.is_dirty = False
 
+    def create_project_view(self, name):
+        view = ProjectView(name, self)
+        view.watcher.directoryChanged.connect(lambda path, v=view: self.on_directory_changed(v, path))
+        self.project_stack.addWidget(view.splitter)
+        return view
+
+    def activate_view(self, view):
+        if self.active_view is not None and self.active_view is not view:
+            self.active_view.estimate_bytes()
+        self.active_view = view
+        self.file_trees = view.trees
+        self.file_splitter = view.splitter
+        self.project_stack.setCurrentWidget(view.splitter)
+
+    def evict_cold_views(self):
+        """Drop least recently used inactive projects until both the count and memory budgets are met."""
+        inactive = [v for v in self.warm_views.values() if v is not self.active_view]
+        total = sum(v.estimated_bytes for v in inactive)
+        while inactive and (len(self.warm_views) > WARM_PROJECT_LIMIT or total > WARM_MEMORY_BUDGET):
+            view = inactive.pop(0)
+            total -= view.estimated_bytes
+            self.discard_view(view.name)
+
+    def discard_view(self, name):
+        view = self.warm_views.pop(name, None)
+        if view is None:
+            return
+        if view is self.active_view:
+            self.active_view = None
+        self.project_stack.removeWidget(view.splitter)
+        view.splitter.deleteLater()
+        view.watcher.deleteLater()
+
+    def watch_items(self, view, items):
+        """Watch every directory in the subtrees of items so the view can update in the background."""
+        paths = set()
+        stack = list(items)
+        while stack:
+            item = stack.pop()
+            if not self.is_dir_item(item):
+                continue
+            path = item.data(0, Qt.ItemDataRole.UserRole)
+            if path:
+                paths.add(path)
+            stack.extend(item.child(i) for i in range(item.childCount()))
+        self.watch_paths(view, paths)
+
+    def watch_paths(self, view, paths):
+        """Add paths to the view's watcher; the watcher's own list is the record of what is watched."""
+        if not paths:
+            return
+        to_add = set(paths) - set(view.watcher.directories())
+        failed = set(view.watcher.addPaths(list(to_add))) if to_add else set()
+        view.unwatched.difference_update(paths)
+        view.unwatched.update(failed)
+
+    def on_directory_changed(self, view, path):
+        view.changed_dirs.add(path)
+        self.watch_timer.start(500)
+
+    def poll_unwatched_dirs(self):
+        """Fallback for directories that could not be watched, e.g. past the inotify watch limit."""
+        for view in self.warm_views.values():
+            view.unwatched = {p for p in view.unwatched if os.path.isdir(p)}
+            view.changed_dirs.update(view.unwatched)
+        self.sync_watched_changes()
+
+    def sync_watched_changes(self):
+        for view in list(self.warm_views.values()):
+            if not view.changed_dirs:
+                continue
+            dir_paths = view.changed_dirs
+            view.changed_dirs = set()
+            new_items = self.sync_directories(view.trees, dir_paths)
+            self.watch_items(view, new_items)
+
+            # Qt drops the watch on a deleted directory, even if it is recreated before we get here
+            live = set(view.watcher.directories())
+            lost = {p for p in dir_paths if p not in live}
+            self.watch_paths(view, {p for p in lost if os.path.isdir(p)})
+            view.unwatched.difference_update(p for p in lost if not os.path.isdir(p))
+            if view is not self.active_view:
+                view.estimate_bytes()
+        self.evict_cold_views()
+
     def add_directory(self):
+        self.ensure_roots_loaded()
         dir_path = QFileDialog.getExistingDirectory(self, "Select Directory")
         if dir_path:
             for tree in self.file_trees:
                 if tree.topLevelItemCount() > 0:
                     existing_root = tree.topLevelItem(0).data(0, Qt.ItemDataRole.UserRole)
-                    if existing_root == dir_path:
+                    if os.path.realpath(existing_root) == os.path.realpath(dir_path):
                         return
 
             self.add_directory_column(dir_path)
             self.save_current_project_state()
 
     def add_directory_column(self, dir_path, checked_set=None, expanded_set=None):
-        if len(self.file_trees) >= 5:
-            QMessageBox.warning(self, "Limit Reached", "Maximum of 5 directory columns allowed.")
-            return
-
         tree = QTreeWidget()
         tree.setHeaderLabel(os.path.basename(dir_path))
         tree.itemChanged.connect(self.mark_dirty)
@@ -372,7 +1274,7 @@ class ClaudeInterfaceApp(QMainWindow):
         
         root_item = QTreeWidgetItem(tree)
         root_item.setText(0, dir_path)
-        root_item.setIcon(0, self.icon_provider.icon(QFileInfo(dir_path)))
+        root_item.setIcon(0, self.file_icon(dir_path))
         root_item.setFlags(root_item.flags() | Qt.ItemFlag.ItemIsAutoTristate | Qt.ItemFlag.ItemIsUserCheckable)
         root_item.setCheckState(0, Qt.CheckState.Unchecked)
         root_item.setData(0, Qt.ItemDataRole.UserRole, dir_path)
@@ -391,6 +1293,7 @@ class ClaudeInterfaceApp(QMainWindow):
         
         self.file_splitter.addWidget(tree)
         self.file_trees.append(tree)
+        self.watch_items(self.active_view, [root_item])
 
     def load_gitignore(self, root_path):
         patterns = ['.git', '__pycache__', '.DS_Store', '*.pyc']
@@ -413,78 +1316,138 @@ class ClaudeInterfaceApp(QMainWindow):
                 return True
         return False
 
-    def refresh_file_trees(self):
-        checked_files = [f[0] for f in self.get_checked_files()]
-        checked_set = set(checked_files)
-        
-        expanded_paths = set()
-        for tree in self.file_trees:
-            iterator = QTreeWidgetItemIterator(tree)
-            while iterator.value():
-                item = iterator.value()
-                if item.isExpanded():
-                    path = item.data(0, Qt.ItemDataRole.UserRole)
-                    if path:
-                        expanded_paths.add(path)
-                iterator += 1
-        
-        for tree in self.file_trees:
-            if tree.topLevelItemCount() == 0: continue
-            
-            root_item = tree.topLevelItem(0)
-            root_path = root_item.data(0, Qt.ItemDataRole.UserRole)
-            
-            tree.blockSignals(True)
-            tree.clear()
-            
-            if os.path.exists(root_path):
-                new_root = QTreeWidgetItem(tree)
-                new_root.setText(0, root_path)
-                new_root.setIcon(0, self.icon_provider.icon(QFileInfo(root_path)))
-                new_root.setFlags(new_root.flags() | Qt.ItemFlag.ItemIsAutoTristate | Qt.ItemFlag.ItemIsUserCheckable)
-                new_root.setCheckState(0, Qt.CheckState.Unchecked)
-                new_root.setData(0, Qt.ItemDataRole.UserRole, root_path)
-                
-                ignore_patterns = self.load_gitignore(root_path)
-                self.populate_tree(root_path, new_root, checked_set, ignore_patterns, expanded_paths)
-                
-                if root_path in expanded_paths:
-                    new_root.setExpanded(True)
-            
-            tree.blockSignals(False)
+    def scan_directory(self, path, ignore_patterns, real_path):
+        """List path through the scan cache; real_path is its resolved location, so only symlinks need resolving."""
+        entries = []
+        for name, is_dir, is_symlink in self.scan_cache.listdir(real_path):
+            if self.is_ignored(name, ignore_patterns):
+                continue
+            real_child = os.path.join(real_path, name)
+            if is_symlink:
+                real_child = os.path.realpath(real_child)
+            entries.append(ScanEntry(name, os.path.join(path, name), real_child, is_dir))
+        return entries
+
+    def build_tree_item(self, entry, checked_set=None):
+        item = QTreeWidgetItem()
+        item.setText(0, entry.name)
+        item.setIcon(0, self.file_icon(entry.path))
+        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        item.setData(0, Qt.ItemDataRole.UserRole, entry.path)
+
+        if entry.is_dir:
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsAutoTristate)
+            item.setCheckState(0, Qt.CheckState.Unchecked)
+        else:
+            is_checked = checked_set and entry.path in checked_set
+            item.setCheckState(0, Qt.CheckState.Checked if is_checked else Qt.CheckState.Unchecked)
+        return item
 
-    def populate_tree(self, path, parent_item, checked_set=None, ignore_patterns=None, expanded_set=None):
+    def populate_tree(self, path, parent_item, checked_set=None, ignore_patterns=None, expanded_set=None, real_path=None):
         if ignore_patterns is None: ignore_patterns = []
+        if real_path is None: real_path = os.path.realpath(path)
+        for entry in self.scan_directory(path, ignore_patterns, real_path):
+            item = self.build_tree_item(entry, checked_set)
+            parent_item.addChild(item)
+
+            if entry.is_dir:
+                self.populate_tree(entry.path, item, checked_set, ignore_patterns, expanded_set, entry.real_path)
+                if expanded_set and entry.path in expanded_set:
+                    item.setExpanded(True)
+
+    def is_dir_item(self, item):
+        return bool(item.flags() & Qt.ItemFlag.ItemIsAutoTristate)
+
+    def find_nearest_item(self, tree, path):
+        """Return the deepest existing item on the way from the tree root to path."""
+        if tree.topLevelItemCount() == 0:
+            return None
+        curr = tree.topLevelItem(0)
+        curr_path = curr.data(0, Qt.ItemDataRole.UserRole)
         try:
-            for entry in sorted(os.scandir(path), key=lambda e: (not e.is_dir(), e.name.lower())):
-                if self.is_ignored(entry.name, ignore_patterns):
-                    continue
+            if os.path.commonpath([curr_path, path]) != curr_path:
+                return None
+        except ValueError:
+            return None
+
+        rel = os.path.relpath(path, curr_path)
+        if rel == '.':
+            return curr
+        for part in rel.split(os.sep):
+            child_path = os.path.join(curr_path, part)
+            for i in range(curr.childCount()):
+                child = curr.child(i)
+                if child.data(0, Qt.ItemDataRole.UserRole) == child_path:
+                    curr, curr_path = child, child_path
+                    break
+            else:
+                break
+        return curr
+
+    def sync_directory_item(self, dir_item, ignore_patterns, checked_set=None):
+        """Bring the direct children of dir_item in line with disk, keeping existing items intact.
+
+        Returns the newly inserted directory items.
+        """
+        dir_path = dir_item.data(0, Qt.ItemDataRole.UserRole)
+        real_dir = os.path.realpath(dir_path)
+        self.scan_cache.invalidate(real_dir)
+        entries = self.scan_directory(dir_path, ignore_patterns, real_dir)
+        on_disk = {e.path: e.is_dir for e in entries}
+
+        existing = {}
+        for i in reversed(range(dir_item.childCount())):
+            child = dir_item.child(i)
+            child_path = child.data(0, Qt.ItemDataRole.UserRole)
+            if on_disk.get(child_path) != self.is_dir_item(child):
+                dir_item.removeChild(child)
+            else:
+                existing[child_path] = child
 
-                item = QTreeWidgetItem(parent_item)
-                item.setText(0, entry.name)
-                
-                file_info = QFileInfo(entry.path)
-                icon = self.icon_provider.icon(file_info)
-                item.setIcon(0, icon)
-
-                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                item.setData(0, Qt.ItemDataRole.UserRole, entry.path)
-
-                if entry.is_dir():
-                    item.setFlags(item.flags() | Qt.ItemFlag.ItemIsAutoTristate)
-                    item.setCheckState(0, Qt.CheckState.Unchecked)
-                    self.populate_tree(entry.path, item, checked_set, ignore_patterns, expanded_set)
-                    if expanded_set and entry.path in expanded_set:
-                        item.setExpanded(True)
-                else:
-                    is_checked = checked_set and entry.path in checked_set
-                    item.setCheckState(0, Qt.CheckState.Checked if is_checked else Qt.CheckState.Unchecked)
-                    
-        except PermissionError:
-            pass
+        new_dirs = []
+        pos = 0
+        for entry in entries:
+            if entry.path in existing:
+                pos = dir_item.indexOfChild(existing[entry.path]) + 1
+                continue
+            item = self.build_tree_item(entry, checked_set)
+            dir_item.insertChild(pos, item)
+            pos += 1
+            if entry.is_dir:
+                self.scan_cache.invalidate(entry.real_path, recursive=True)
+                self.populate_tree(entry.path, item, checked_set, ignore_patterns, real_path=entry.real_path)
+                new_dirs.append(item)
+        return new_dirs
+
+    def refresh_changed_paths(self, paths, checked_set=None):
+        """Update only the directory nodes containing the given paths instead of rescanning every root."""
+        dir_paths = {os.path.dirname(os.path.normpath(p)) for p in paths}
+        new_items = self.sync_directories(self.file_trees, dir_paths, checked_set)
+        self.watch_items(self.active_view, new_items)
+
+    def sync_directories(self, trees, dir_paths, checked_set=None):
+        new_items = []
+        for tree in trees:
+            if tree.topLevelItemCount() == 0: continue
+            root_path = tree.topLevelItem(0).data(0, Qt.ItemDataRole.UserRole)
+            ignore_patterns = self.load_gitignore(root_path)
+
+            targets = {}
+            for dir_path in dir_paths:
+                item = self.find_nearest_item(tree, dir_path)
+                if item is not None:
+                    targets[item.data(0, Qt.ItemDataRole.UserRole)] = item
+
+            tree.blockSignals(True)
+            for item in targets.values():
+                new_items.extend(self.sync_directory_item(item, ignore_patterns, checked_set))
+            tree.blockSignals(False)
+        return new_items
 
     def get_checked_files(self):
+        """Checked files across all trees, each real file once even if it sits under several roots."""
         checked_files = []
+        seen = set()
         for tree in self.file_trees:
             iterator = QTreeWidgetItemIterator(tree, QTreeWidgetItemIterator.IteratorFlag.Checked)
             while iterator.value():
@@ -492,7 +1455,9 @@ class ClaudeInterfaceApp(QMainWindow):
                 path = item.data(0, Qt.ItemDataRole.UserRole)
                 if path and os.path.isfile(path):
                     root_path = self.get_root_path(item)
-                    if root_path:
+                    real_path = os.path.realpath(path)
+                    if root_path and real_path not in seen:
+                        seen.add(real_path)
                         rel_path = os.path.relpath(path, root_path)
                         checked_files.append((path, rel_path))
                 iterator += 1
@@ -505,10 +1470,32 @@ class ClaudeInterfaceApp(QMainWindow):
         return curr.data(0, Qt.ItemDataRole.UserRole)
 
     def copy_context_to_clipboard(self):
+        self.ensure_roots_loaded()
         files = self.get_checked_files()
+        cache_friendly = self.chk_cache_order.isChecked()
         output = []
+
+        if cache_friendly:
+            files = self.order_files_for_cache(files)
+            if self.chk_include_sys.isChecked():
+                output.extend(self.system_prompt_section())
+
+        output.extend(self.files_section(files))
         
-        output.append("Files:")
+        if self.chk_include_sys.isChecked() and not cache_friendly:
+            output.extend(self.system_prompt_section())
+
+        user_context = self.text_context.toPlainText().strip()
+        if user_context:
+            output.append(f"\nContext/Instructions:\n{user_context}\n")
+
+        self.copy_payload("\n".join(output), "Context copied to clipboard!")
+
+    def system_prompt_section(self):
+        return ["\n=== System Prompt ===", self.system_prompt, "=====================\n"]
+
+    def files_section(self, files):
+        output = ["Files:"]
         for abs_path, rel_path in files:
             try:
                 with open(abs_path, 'r', encoding='utf-8') as f:
@@ -516,19 +1503,25 @@ class ClaudeInterfaceApp(QMainWindow):
                 output.append(f"File: {abs_path}\n```\n{content}\n```\n")
             except Exception as e:
                 output.append(f"File: {abs_path} (Error reading file: {e})\n")
-        
-        if self.chk_include_sys.isChecked():
-            output.append("\n=== System Prompt ===")
-            output.append(self.system_prompt)
-            output.append("=====================\n")
+        return output
 
-        user_context = self.text_context.toPlainText().strip()
-        if user_context:
-            output.append(f"\nContext/Instructions:\n{user_context}\n")
+    def order_files_for_cache(self, files):
+        """Least recently changed files first, so edits only invalidate the tail of a cached prompt prefix."""
+        def last_modified(file_entry):
+            try:
+                return os.path.getmtime(file_entry[0])
+            except OSError:
+                return float('inf')
+        return sorted(files, key=lambda f: (last_modified(f), f[0]))
 
-        full_text = "\n".join(output)
+    def copy_payload(self, full_text, msg):
         QApplication.clipboard().setText(full_text)
-        self.status_message("Context copied to clipboard!")
+        payload = full_text.encode('utf-8')
+        if self.last_copied_payload is not None:
+            unchanged = common_prefix_length(self.last_copied_payload, payload)
+            msg += f" {unchanged} of {len(payload)} leading bytes unchanged since last copy."
+        self.last_copied_payload = payload
+        self.status_message(msg)
 
     def copy_system_prompt(self):
         QApplication.clipboard().setText(self.system_prompt)
@@ -536,17 +1529,11 @@ class ClaudeInterfaceApp(QMainWindow):
 
     def copy_for_related_files(self):
         """Copy context with the related files prompt appended."""
+        self.ensure_roots_loaded()
         files = self.get_checked_files()
-        output = []
-        
-        output.append("Files:")
-        for abs_path, rel_path in files:
-            try:
-                with open(abs_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                output.append(f"File: {abs_path}\n```\n{content}\n```\n")
-            except Exception as e:
-                output.append(f"File: {abs_path} (Error reading file: {e})\n")
+        if self.chk_cache_order.isChecked():
+            files = self.order_files_for_cache(files)
+        output = self.files_section(files)
         
         user_context = self.text_context.toPlainText().strip()
         if user_context:
@@ -554,12 +1541,11 @@ class ClaudeInterfaceApp(QMainWindow):
         
         output.append(f"\n{self.related_files_prompt}")
         
-        full_text = "\n".join(output)
-        QApplication.clipboard().setText(full_text)
-        self.status_message("Context with related files prompt copied to clipboard!")
+        self.copy_payload("\n".join(output), "Context with related files prompt copied to clipboard!")
 
     def select_files_from_clipboard(self):
         """Parse paths from clipboard and select only those files in the file trees."""
+        self.ensure_roots_loaded()
         clipboard_text = QApplication.clipboard().text()
         if not clipboard_text:
             self.status_message("Clipboard is empty.")
@@ -586,14 +1572,14 @@ class ClaudeInterfaceApp(QMainWindow):
             return
         
         # Collect all known absolute paths from file trees
-        tree_paths = {}  # abs_path -> (tree, item) mapping
+        tree_paths = {}  # abs_path -> [item, ...], one per root the file appears under
         for tree in self.file_trees:
             iterator = QTreeWidgetItemIterator(tree)
             while iterator.value():
                 item = iterator.value()
                 path = item.data(0, Qt.ItemDataRole.UserRole)
                 if path and os.path.isfile(path):
-                    tree_paths[path] = (tree, item)
+                    tree_paths.setdefault(path, []).append(item)
                 iterator += 1
         
         # Build mapping of path variations to absolute paths
@@ -649,8 +1635,7 @@ class ClaudeInterfaceApp(QMainWindow):
         
         # Check only matched files
         for abs_path in matched_paths:
-            if abs_path in tree_paths:
-                tree, item = tree_paths[abs_path]
+            for item in tree_paths.get(abs_path, []):
                 item.setCheckState(0, Qt.CheckState.Checked)
                 # Expand parent directories to make selected files visible
                 parent = item.parent()
@@ -670,71 +1655,97 @@ class ClaudeInterfaceApp(QMainWindow):
         self.mark_dirty()
 
     def paste_and_apply(self):
+        self.ensure_roots_loaded()
         response = QApplication.clipboard().text()
         if not response:
             self.show_error("Clipboard is empty.")
             return
 
-        changes_log = []
-        
-        header_pattern = re.compile(r'^(?P<type>Updated path:|New:|Replace file:|Delete:)\s*(?P<path>[^\n]+)', re.MULTILINE)
-        
-        matches = list(header_pattern.finditer(response))
-        if not matches:
-            QMessageBox.information(self, "Result", "No valid patterns found in clipboard content.")
+        operations, changes_log = parse_response(response)
+        self.apply_operations(operations, changes_log, "clipboard content")
+
+    def apply_response_file(self):
+        self.ensure_roots_loaded()
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select Response File")
+        if not file_path:
             return
 
-        for i, match in enumerate(matches):
-            header_type = match.group('type')
-            path_str = match.group('path').strip().strip('`\'"')
-            
-            start_index = match.start()
-            end_index = matches[i+1].start() if i + 1 < len(matches) else len(response)
-            segment = response[start_index:end_index]
-            
-            if header_type == "Updated path:":
-                mod_pattern = re.compile(
-                    r'Replace:\s*\n```(?:\w+)?\n(?P<search>.*?)```\s*\n'
-                    r'.*?'
-                    r'With:\s*\n```(?:\w+)?\n(?P<replace>.*?)```',
-                    re.DOTALL
-                )
-                
-                replacements = list(mod_pattern.finditer(segment))
-                if replacements:
-                    for rep_match in replacements:
-                        search_block = rep_match.group('search')
-                        replace_block = rep_match.group('replace')
-                        if self.modify_file(path_str, search_block, replace_block):
-                             changes_log.append(f"Modified: {path_str}")
-                        else:
-                             changes_log.append(f"Failed to modify: {path_str}")
-                else:
-                    changes_log.append(f"No Replace/With blocks found for: {path_str}")
-
-            elif header_type == "New:" or header_type == "Replace file:":
-                content_pattern = re.compile(r'Content:\s*\n.*?```(?:\w+)?\n(?P<content>.*?)```', re.DOTALL)
-                c_match = content_pattern.search(segment)
-                if c_match:
-                    content = c_match.group('content')
-                    if self.create_file(path_str, content):
-                        changes_log.append(f"Created: {path_str}")
-                    else:
-                        changes_log.append(f"Failed to create: {path_str}")
-                else:
-                    changes_log.append(f"No content found for new file: {path_str}")
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                operations, changes_log = parse_stream(f)
+        except Exception as e:
+            self.show_error(f"Error reading {file_path}: {e}")
+            return
+        self.apply_operations(operations, changes_log, os.path.basename(file_path))
 
-            elif header_type == "Delete:":
-                if self.delete_file(path_str):
-                    changes_log.append(f"Deleted: {path_str}")
+    def apply_operations(self, operations, changes_log, source):
+        if not operations and not changes_log:
+            QMessageBox.information(self, "Result", f"No valid patterns found in {source}.")
+            return
+
+        file_operations = self.group_operations(operations, changes_log)
+        if not file_operations:
+            QMessageBox.information(self, "Result", "\n".join(changes_log))
+            return
+
+        if self.chk_review_changes.isChecked():
+            dialog = DiffPreviewDialog(file_operations, self)
+            accepted = dialog.exec() == QDialog.DialogCode.Accepted
+            plans = dialog.selected_plans() if accepted else []
+            dialog.deleteLater()
+            if not accepted:
+                return
+        else:
+            plans = [build_file_plan(*file_op) for file_op in file_operations]
+
+        self.commit_file_plans(plans, changes_log)
+
+    def group_operations(self, operations, changes_log):
+        """Resolve operation paths and group them per file, keeping response order."""
+        grouped = {}
+        for op in operations:
+            abs_path = self.resolve_abs_path(op.path)
+            if not abs_path:
+                changes_log.append(f"Failed to {op.kind}: {op.path}")
+                continue
+            abs_path = os.path.normpath(abs_path)
+            if abs_path not in grouped:
+                grouped[abs_path] = (abs_path, op.path, [])
+            grouped[abs_path][2].append(op)
+        return list(grouped.values())
+
+    def commit_file_plans(self, plans, changes_log):
+        applied = AppliedChanges()
+        for plan in plans:
+            changes_log.extend(plan.log)
+            if not plan.hunks or not any(plan.selected):
+                continue
+
+            content = plan.build_content()
+            if content is None:
+                if self.delete_file(plan.abs_path, applied):
+                    changes_log.append(f"Deleted: {plan.display_path}")
                 else:
-                    changes_log.append(f"Failed to delete: {path_str}")
+                    changes_log.append(f"Failed to delete: {plan.display_path}")
+            elif self.create_file(plan.abs_path, content, applied):
+                verb = "Created" if plan.abs_path in applied.created else "Modified"
+                changes_log.append(f"{verb}: {plan.display_path}")
+            else:
+                changes_log.append(f"Failed to write: {plan.display_path}")
 
         if not changes_log:
             QMessageBox.information(self, "Result", "No changes applied.")
         else:
             QMessageBox.information(self, "Result", "\n".join(changes_log))
-            self.refresh_file_trees() 
+            self.refresh_applied_changes(applied)
+
+    def refresh_applied_changes(self, applied):
+        if not applied.structural_paths():
+            return
+        checked_set = applied.created if self.chk_auto_check_new.isChecked() else None
+        self.refresh_changed_paths(applied.structural_paths(), checked_set)
+        if checked_set:
+            self.mark_dirty()
 
     def resolve_abs_path(self, path):
         path = path.strip().replace('\\', '/')
@@ -758,66 +1769,33 @@ class ClaudeInterfaceApp(QMainWindow):
         
         return path if os.path.isabs(path) else None
 
-    def create_file(self, rel_path, content):
+    def create_file(self, rel_path, content, applied=None):
         abs_path = self.resolve_abs_path(rel_path)
         if not abs_path: return False
         try:
+            existed = os.path.exists(abs_path)
             os.makedirs(os.path.dirname(abs_path), exist_ok=True)
             with open(abs_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            if applied is not None:
+                (applied.modified if existed else applied.created).add(os.path.normpath(abs_path))
             return True
         except Exception as e:
             print(f"Error creating {abs_path}: {e}")
             return False
 
-    def delete_file(self, rel_path):
+    def delete_file(self, rel_path, applied=None):
         abs_path = self.resolve_abs_path(rel_path)
         if not abs_path or not os.path.exists(abs_path):
             return False
         try:
             os.remove(abs_path)
+            if applied is not None:
+                applied.deleted.add(os.path.normpath(abs_path))
             return True
         except Exception:
             return False
 
-    def modify_file(self, rel_path, search_txt, replace_txt):
-        abs_path = self.resolve_abs_path(rel_path)
-        if not abs_path or not os.path.exists(abs_path):
-            print(f"File not found: {abs_path}")
-            return False
-        
-        try:
-            with open(abs_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if search_txt in content:
-                new_content = content.replace(search_txt, replace_txt)
-                with open(abs_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
-                return True
-            else:
-                norm_content = content.replace('\r\n', '\n')
-                norm_search = search_txt.replace('\r\n', '\n')
-                norm_search_stripped = norm_search.strip()
-                
-                if norm_search in norm_content:
-                    new_content = norm_content.replace(norm_search, replace_txt)
-                    with open(abs_path, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
-                    return True
-                
-                if norm_search_stripped in norm_content:
-                     new_content = norm_content.replace(norm_search_stripped, replace_txt)
-                     with open(abs_path, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
-                     return True
-
-                print(f"Search block not found in {rel_path}")
-                return False
-        except Exception as e:
-            print(f"Error modifying {abs_path}: {e}")
-            return False
-
     def status_message(self, msg):
         self.statusBar().showMessage(msg, 3000)
 
@@ -825,8 +1803,13 @@ class ClaudeInterfaceApp(QMainWindow):
         QMessageBox.critical(self, "Error", msg)
 
 if __name__ == "__main__":
+    if "--parse-response" in sys.argv:
+        args = sys.argv[sys.argv.index("--parse-response") + 1:]
+        sys.exit(print_parse_report(args[0] if args else "-"))
+
+    startup_timer = StartupTimer("--startup-timing" in sys.argv)
     app = QApplication(sys.argv)
     app.setStyle(QStyleFactory.create("Fusion"))
-    window = ClaudeInterfaceApp()
+    window = ClaudeInterfaceApp(startup_timer)
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,38 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from main import EditOperation, build_file_plan
+
+
+def write_lines(tmp_path, count):
+    path = tmp_path / "module.py"
+    path.write_text("".join(f"line{i}\n" for i in range(count)), encoding="utf-8")
+    return str(path)
+
+
+def test_build_content_with_all_hunks_selected_returns_new_text(tmp_path):
+    path = write_lines(tmp_path, 40)
+    plan = build_file_plan(path, path, [EditOperation("modify", path, search="line20\n", replace="LINE20\n")])
+
+    assert plan.build_content() == plan.new_text
+    assert len(plan.build_content().splitlines()) == 40
+
+
+def test_build_content_keeps_untouched_lines_for_deselected_hunks(tmp_path):
+    path = write_lines(tmp_path, 100)
+    operations = [
+        EditOperation("modify", path, search="line2\n", replace="LINE2\n"),
+        EditOperation("modify", path, search="line80\n", replace="LINE80\n"),
+    ]
+    plan = build_file_plan(path, path, operations)
+    assert len(plan.hunks) == 2
+
+    plan.selected = [True, False]
+    lines = plan.build_content().splitlines()
+
+    assert len(lines) == 100
+    assert lines[2] == "LINE2"
+    assert lines[80] == "line80"
+    assert lines[99] == "line99"
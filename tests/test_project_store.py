@@ -0,0 +1,48 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from main import PathTree, ProjectStore, encode_path_set
+
+
+PATHS = {
+    "/repo",
+    "/repo/src",
+    "/repo/src/app.py",
+    "/repo/src/pkg/util.py",
+    "/repo/README.md",
+    "/repo/lib",
+    "/repo/lib/core.py",
+}
+
+
+def test_path_tree_membership_matches_set():
+    tree = PathTree(encode_path_set(PATHS, ["/repo", "/repo/lib"]))
+
+    for path in PATHS:
+        assert path in tree
+    for path in ["/repo/src/pkg", "/repo/src/other.py", "/repo/lib/x.py", "/elsewhere/app.py", "/"]:
+        assert path not in tree
+    assert set(tree) == PATHS
+
+
+def test_empty_path_tree_is_falsy():
+    assert not PathTree({})
+    assert "/repo" not in PathTree({})
+
+
+def test_store_round_trip(tmp_path):
+    store = ProjectStore(str(tmp_path / "projects.json"), str(tmp_path / "projects.d"))
+    store.put("Main", {"roots": ["/repo"], "context": "ctx", "checked": {"/repo/src/app.py"}, "expanded": {"/repo"}})
+    store.save_index("Main")
+
+    reloaded = ProjectStore(str(tmp_path / "projects.json"), str(tmp_path / "projects.d"))
+    assert reloaded.load() == "Main"
+    assert reloaded.cache == {}
+
+    state = reloaded.get("Main")
+    assert state["context"] == "ctx"
+    assert "/repo/src/app.py" in state["checked"]
+    assert "/repo/src" not in state["checked"]
+    assert "/repo" in state["expanded"]
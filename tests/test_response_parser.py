@@ -0,0 +1,121 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from main import ResponseParser, parse_response
+
+
+RESPONSE = """Here are the changes.
+Updated path: /repo/a.py
+Replace:
+```python
+old = 1
+```
+With:
+```python
+new = 1
+```
+New: /repo/b.py
+Content:
+```
+print("b")
+```
+Replace file: `/repo/c.py`
+Content:
+```
+c = 3
+```
+Delete: /repo/d.py
+"""
+
+
+def summarize(operations):
+    return [(op.kind, op.path, op.search, op.replace, op.content, op.line) for op in operations]
+
+
+def test_parses_every_block_type():
+    operations, messages = parse_response(RESPONSE)
+
+    assert messages == []
+    assert summarize(operations) == [
+        ("modify", "/repo/a.py", "old = 1\n", "new = 1\n", None, 2),
+        ("create", "/repo/b.py", None, None, 'print("b")\n', 11),
+        ("create", "/repo/c.py", None, None, "c = 3\n", 16),
+        ("delete", "/repo/d.py", None, None, None, 21),
+    ]
+
+
+def test_chunked_input_matches_whole_input():
+    parser = ResponseParser()
+    for char in RESPONSE:
+        parser.feed(char)
+    operations, messages = parser.close()
+
+    assert messages == []
+    assert summarize(operations) == summarize(parse_response(RESPONSE)[0])
+
+
+def test_unterminated_fence_does_not_swallow_next_block():
+    response = (
+        "New: a.py\n"
+        "Content:\n"
+        "```\n"
+        "x=1\n"
+        "\n"
+        "Updated path: b.py\n"
+        "Replace:\n"
+        "```\n"
+        "old\n"
+        "```\n"
+        "With:\n"
+        "```\n"
+        "new\n"
+        "```\n"
+        "Delete: c.py\n"
+    )
+    operations, messages = parse_response(response)
+
+    assert [(op.kind, op.path) for op in operations] == [("modify", "b.py"), ("delete", "c.py")]
+    assert messages == ["Line 3: Unterminated code block after Content: for: a.py"]
+
+
+def test_fence_closing_on_last_code_line():
+    response = (
+        "Updated path: a.py\n"
+        "Replace:\n"
+        "```python\n"
+        "def f():\n"
+        "    return 1```\n"
+        "With:\n"
+        "```python\n"
+        "def f():\n"
+        "    return 2```\n"
+        "Delete: b.py\n"
+    )
+    operations, messages = parse_response(response)
+
+    assert messages == []
+    assert summarize(operations)[0][2:4] == ("def f():\n    return 1", "def f():\n    return 2")
+    assert operations[1].kind == "delete"
+
+
+def test_reports_malformed_blocks_with_line_numbers():
+    response = (
+        "Updated path: a.py\n"
+        "Nothing useful here.\n"
+        "New: b.py\n"
+        "Updated path: c.py\n"
+        "Replace:\n"
+        "```\n"
+        "old\n"
+        "```\n"
+    )
+    operations, messages = parse_response(response)
+
+    assert operations == []
+    assert messages == [
+        "Line 1: No Replace/With blocks found for: a.py",
+        "Line 3: No content found for new file: b.py",
+        "Line 4: Replace: block without a With: block for: c.py",
+    ]